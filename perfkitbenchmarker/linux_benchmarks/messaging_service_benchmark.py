@@ -98,6 +98,36 @@ _WARMUP_MESSAGES = flags.DEFINE_integer(
         'steady_state metrics will be reported (this is the default).'
     ),
 )
+_INCLUDE_RAW_SAMPLES = flags.DEFINE_boolean(
+    'messaging_service_include_raw_samples',
+    True,
+    help=(
+        'Whether to report every individual latency as the "samples" metadata '
+        'of the mean latency metrics. Disable for runs with many messages to '
+        'keep the results small.'
+    ),
+)
+_MAX_IN_FLIGHT_PUBLISHES = flags.DEFINE_integer(
+    'messaging_service_max_in_flight_publishes',
+    1,
+    lower_bound=1,
+    help=(
+        'Maximum number of concurrent publish requests in the publish latency '
+        'measurement. Each message is still timed individually. If set to 1, '
+        'messages are published one at a time (this is the default).'
+    ),
+)
+_TARGET_QPS = flags.DEFINE_float(
+    'messaging_service_target_qps',
+    0,
+    lower_bound=0,
+    help=(
+        'If set, the publish latency measurement runs open-loop: messages are '
+        'scheduled at this fixed rate and each latency is measured from the '
+        "message's intended send time. If set to 0, each message is sent as "
+        'soon as possible (this is the default).'
+    ),
+)
 
 
 @flags.multi_flags_validator(
@@ -143,6 +173,9 @@ def _CreateSamples(
     message_size: int,
     cloud: str,
     streaming_pull: bool,
+    include_raw_samples: bool,
+    max_in_flight_publishes: int,
+    target_qps: float,
 ) -> List[sample.Sample]:
   """Handles sample creation from benchmark_scenario results."""
   samples = []
@@ -151,6 +184,9 @@ def _CreateSamples(
       'message_size': message_size,
       'cloud': cloud,
       'streaming_pull': streaming_pull,
+      'include_raw_samples': include_raw_samples,
+      'max_in_flight_publishes': max_in_flight_publishes,
+      'target_qps': target_qps,
   }
   failure_counter = None
   for metric_name in results:
@@ -201,18 +237,25 @@ def Run(benchmark_spec: bm_spec.BenchmarkSpec) -> List[sample.Sample]:
     (on 'messaging_service.Run()' call).
   """
   service = benchmark_spec.messaging_service
+  runner_options = {
+      'include_raw_samples': _INCLUDE_RAW_SAMPLES.value,
+      'max_in_flight_publishes': _MAX_IN_FLIGHT_PUBLISHES.value,
+      'target_qps': _TARGET_QPS.value,
+  }
   if _MEASUREMENT.value == SINGLE_OP:
     publish_results = service.Run(
         service.PUBLISH_LATENCY,
         int(_NUMBER_OF_MESSAGES.value),
         int(_MESSAGE_SIZE.value),
         int(_WARMUP_MESSAGES.value),
+        **runner_options,
     )
     pull_results = service.Run(
         service.PULL_LATENCY,
         int(_NUMBER_OF_MESSAGES.value),
         int(_MESSAGE_SIZE.value),
         int(_WARMUP_MESSAGES.value),
+        **runner_options,
     )
     publish_results.update(pull_results)
     results = publish_results
@@ -223,6 +266,7 @@ def Run(benchmark_spec: bm_spec.BenchmarkSpec) -> List[sample.Sample]:
         int(_MESSAGE_SIZE.value),
         int(_WARMUP_MESSAGES.value),
         _STREAMING_PULL.value,
+        **runner_options,
     )
   # Creating samples from results
   samples = _CreateSamples(
@@ -231,6 +275,7 @@ def Run(benchmark_spec: bm_spec.BenchmarkSpec) -> List[sample.Sample]:
       int(_MESSAGE_SIZE.value),
       FLAGS.cloud,
       _STREAMING_PULL.value,
+      **runner_options,
   )
   return samples
 
@@ -38,8 +38,9 @@ Each workload runs for at most 30 minutes.
 from collections.abc import Mapping, Sequence
 import copy
 import datetime
-import io
+import itertools
 import logging
+import math
 import os
 import posixpath
 import re
@@ -500,6 +501,7 @@ _ycsb_tar_url = None
 
 # Parameters for incremental workload. Can be made into flags in the future.
 _INCREMENTAL_STARTING_QPS = 500
+_INCREMENTAL_QPS_FACTOR = 1.5
 _INCREMENTAL_TIMELIMIT_SEC = 60 * 5
 
 # The upper-bound number of milliseconds above the measured minimum after which
@@ -561,11 +563,12 @@ def _GetVersionFromUrl(url: str) -> int:
 def _GetThreadsQpsPerLoaderList(num_vms: int) -> list[list[int]]:
   """Returns the list of [client, qps] per VM to use in staircase load."""
 
+  default_target = int(_TARGET_QPS.value / num_vms) if _TARGET_QPS.value else 0
+
   def _FormatThreadQps(thread_qps: str) -> list[int]:
     thread_qps_pair = thread_qps.split(':')
     if len(thread_qps_pair) == 1:
-      target = int(_TARGET_QPS.value / num_vms) if _TARGET_QPS.value else 0
-      thread_qps_pair.append(target)
+      thread_qps_pair.append(default_target)
     return [int(val) for val in thread_qps_pair]
 
   return [
@@ -585,11 +588,19 @@ def GetWorkloadFileList() -> list[str]:
   return [data.ResourcePath(workload) for workload in FLAGS.ycsb_workload_files]
 
 
+def _SplitParameter(kv: str) -> tuple[str, str]:
+  """Splits a 'param=value' entry of --ycsb_{load,run}_parameters."""
+  param, sep, value = kv.partition('=')
+  if not sep:
+    raise ValueError(f'Expected a param=value YCSB parameter, got: {kv!r}')
+  return param, value
+
+
 def _GetRunParameters() -> dict[str, str]:
   """Returns a dict of params from the --ycsb_run_parameters flag."""
   result = {}
   for kv in FLAGS.ycsb_run_parameters:
-    param, value = kv.split('=', 1)
+    param, value = _SplitParameter(kv)
     result[param] = value
   return result
 
@@ -601,9 +612,12 @@ def CheckPrerequisites():
     IOError: On missing workload file.
     errors.Config.InvalidValue on unsupported YCSB version or configs.
   """
-  for workload_file in GetWorkloadFileList():
-    if not os.path.exists(workload_file):
-      raise OSError('Missing workload file: {}'.format(workload_file))
+  # ResourcePath already checks that the file exists.
+  for workload_file in FLAGS.ycsb_workload_files:
+    try:
+      data.ResourcePath(workload_file)
+    except data.ResourceNotFound as e:
+      raise OSError('Missing workload file: {}'.format(workload_file)) from e
 
   if _YCSB_COMMIT.value and _YCSB_TAR_URL.value:
     raise errors.Config.InvalidValue(
@@ -625,7 +639,7 @@ def CheckPrerequisites():
   # Following flags are mutully exclusive.
   run_target = 'target' in run_params
   per_thread_target = any(
-      [':' in thread_qps for thread_qps in FLAGS.ycsb_threads_per_client]
+      ':' in thread_qps for thread_qps in FLAGS.ycsb_threads_per_client
   )
   flag_target = _TARGET_QPS.value is not None
   lowest_latency_target = _LOWEST_LATENCY_TARGET_QPS.value is not None
@@ -754,17 +768,21 @@ def ParseWorkload(contents):
   Returns:
     dict mapping from property key to property value for each property found in
     'contents'.
+
+  Raises:
+    ValueError: if a property line has no '=' or ':' separator.
   """
-  fp = io.StringIO(contents)
   result = {}
-  for line in fp:
-    if (
-        line.strip()
-        and not line.lstrip().startswith('#')
-        and not line.lstrip().startswith('!')
-    ):
-      k, v = re.split(r'\s*[:=]\s*', line, maxsplit=1)
-      result[k] = v.strip()
+  for line in contents.splitlines():
+    stripped = line.lstrip()
+    if not stripped or stripped[0] in '#!':
+      continue
+    # Split on the first separator; whitespace around it is not significant.
+    separators = [i for i in (line.find('='), line.find(':')) if i >= 0]
+    if not separators:
+      raise ValueError(f'No "=" or ":" separator in workload line: {line!r}')
+    i = min(separators)
+    result[line[:i].rstrip()] = line[i + 1 :].strip()
   return result
 
 
@@ -871,7 +889,7 @@ class YCSBExecutor:
     if FLAGS.ycsb_record_count:
       kwargs.setdefault('recordcount', FLAGS.ycsb_record_count)
     for pv in FLAGS.ycsb_load_parameters:
-      param, value = pv.split('=', 1)
+      param, value = _SplitParameter(pv)
       kwargs[param] = value
     command = self._BuildCommand('load', **kwargs)
     stdout, stderr = vm.RobustRemoteCommand(command)
@@ -918,6 +936,7 @@ class YCSBExecutor:
         n_per_client + (1 if i < (record_count % len(vms)) else 0)
         for i in range(len(vms))
     ]
+    loader_starts = list(itertools.accumulate(loader_counts, initial=0))
 
     remote_path = posixpath.join(
         linux_packages.INSTALL_DIR, os.path.basename(workload_file)
@@ -929,8 +948,10 @@ class YCSBExecutor:
     kwargs['parameter_files'] = [remote_path]
 
     def _Load(loader_index):
-      start = sum(loader_counts[:loader_index])
-      kw = copy.deepcopy(kwargs)
+      start = loader_starts[loader_index]
+      # Parameters are only ever rebound, never mutated in place, so a shallow
+      # copy per loader is enough.
+      kw = dict(kwargs)
       kw.update(insertstart=start, insertcount=loader_counts[loader_index])
       if self.perclientparam is not None:
         kw.update(self.perclientparam[loader_index])
@@ -944,7 +965,7 @@ class YCSBExecutor:
         event='load',
         start_timestamp=start,
         end_timestamp=time.time(),
-        metadata=copy.deepcopy(kwargs),
+        metadata=dict(kwargs),
     )
 
     if len(results) != len(vms):
@@ -988,7 +1009,7 @@ class YCSBExecutor:
   def _Run(self, vm, **kwargs):
     """Run a single workload from a client vm."""
     for pv in FLAGS.ycsb_run_parameters:
-      param, value = pv.split('=', 1)
+      param, value = _SplitParameter(pv)
       kwargs[param] = value
     command = self._BuildCommand('run', **kwargs)
     # YCSB version greater than 0.7.0 output some of the
@@ -1026,17 +1047,18 @@ class YCSBExecutor:
           n_per_client + (1 if i < (record_count % len(vms)) else 0)
           for i in range(len(vms))
       ]
+      loader_starts = list(itertools.accumulate(loader_counts, initial=0))
 
     def _Run(loader_index):
       """Run YCSB on an individual VM."""
       vm = vms[loader_index]
-      params = copy.deepcopy(kwargs)
+      params = dict(kwargs)
       params['target'] = targets[loader_index]
       if self.perclientparam is not None:
         params.update(self.perclientparam[loader_index])
       if self.shardkeyspace:
-        start = sum(loader_counts[:loader_index])
-        end = start + loader_counts[loader_index]
+        start = loader_starts[loader_index]
+        end = loader_starts[loader_index + 1]
         params.update(insertstart=start, recordcount=end)
       results.append(self._Run(vm, **params))
       logging.info('VM %d (%s) finished', loader_index, vm)
@@ -1102,6 +1124,8 @@ class YCSBExecutor:
     """
     all_results = []
     parameters = {}
+    # Workloads only need to be pushed once to each distinct VM.
+    unique_vms = list(dict.fromkeys(vms))
     for workload_index, workload_file in enumerate(workloads):
       if FLAGS.ycsb_operation_count:
         parameters = {'operationcount': FLAGS.ycsb_operation_count}
@@ -1139,9 +1163,7 @@ class YCSBExecutor:
             stage='run',
         )
 
-      args = [
-          ((vm, workload_file, remote_path), {}) for vm in dict.fromkeys(vms)
-      ]
+      args = [((vm, workload_file, remote_path), {}) for vm in unique_vms]
       background_tasks.RunThreaded(PushWorkload, args)
 
       parameters['parameter_files'] = [remote_path]
@@ -1180,7 +1202,7 @@ class YCSBExecutor:
               event='run',
               start_timestamp=start,
               end_timestamp=time.time(),
-              metadata=copy.deepcopy(parameters),
+              metadata=dict(parameters),
           )
           client_meta = workload_meta.copy()
           client_meta.update(parameters)
@@ -1192,7 +1214,7 @@ class YCSBExecutor:
           # The target passed in is applied to each client VM, so multiply by
           # len(vms).
           for pv in FLAGS.ycsb_run_parameters:
-            param, value = pv.split('=', 1)
+            param, value = _SplitParameter(pv)
             if param == 'target':
               value = int(value) * len(vms)
             client_meta[param] = value
@@ -1358,8 +1380,7 @@ class YCSBExecutor:
     """Sets the --ycsb_run_parameters flag."""
     # Ideally YCSB should be refactored to include a function that just takes
     # commands for a run, but that will be a large refactor.
-    FLAGS['ycsb_run_parameters'].unparse()
-    FLAGS['ycsb_run_parameters'].parse([f'{k}={v}' for k, v in params.items()])
+    FLAGS.ycsb_run_parameters = [f'{k}={v}' for k, v in params.items()]
 
   def _RunBurstMode(self, vms, workloads, run_kwargs=None):
     """Runs YCSB in burst mode, where the second run has increased QPS."""
@@ -1385,17 +1406,24 @@ class YCSBExecutor:
     return samples + burst_samples
 
   def _GetIncrementalQpsTargets(self, target_qps: int) -> list[int]:
-    """Returns incremental QPS targets."""
-    qps = _INCREMENTAL_STARTING_QPS
-    result = []
-    while qps < target_qps:
-      result.append(qps)
-      qps *= 1.5
-    return result
+    """Returns geometrically increasing QPS targets below target_qps."""
+    if target_qps <= _INCREMENTAL_STARTING_QPS:
+      return []
+    steps = math.ceil(
+        math.log(
+            target_qps / _INCREMENTAL_STARTING_QPS, _INCREMENTAL_QPS_FACTOR
+        )
+    )
+    # The step count is only used as a bound; the filter below guards against
+    # rounding in the logarithm at exact powers of the factor.
+    targets = (
+        int(_INCREMENTAL_STARTING_QPS * _INCREMENTAL_QPS_FACTOR**step)
+        for step in range(steps + 1)
+    )
+    return [qps for qps in targets if qps < target_qps]
 
   def _SetClientThreadCount(self, count: int) -> None:
-    FLAGS['ycsb_threads_per_client'].unparse()
-    FLAGS['ycsb_threads_per_client'].parse([str(count)])
+    FLAGS.ycsb_threads_per_client = [str(count)]
 
   def _RunIncrementalMode(
       self,
@@ -1429,20 +1457,20 @@ class YCSBExecutor:
     ending_threadcount = int(FLAGS.ycsb_threads_per_client[0])
     incremental_targets = self._GetIncrementalQpsTargets(ending_qps)
     logging.info('Incremental targets: %s', incremental_targets)
+    client_vms = len(vms)
+    targets_per_vm = [int(qps / client_vms) for qps in incremental_targets]
 
     # Warm-up phase is shorter and doesn't need results parsing
-    FLAGS['ycsb_timelimit'].parse(_INCREMENTAL_TIMELIMIT_SEC)
-    for target in incremental_targets:
-      target /= len(vms)
-      run_params['target'] = int(target)
-      self._SetClientThreadCount(min(ending_threadcount, int(target)))
+    FLAGS.ycsb_timelimit = _INCREMENTAL_TIMELIMIT_SEC
+    for target in targets_per_vm:
+      run_params['target'] = target
+      self._SetClientThreadCount(min(ending_threadcount, target))
       self._SetRunParameters(run_params)
       self.RunStaircaseLoads(vms, workloads, **run_kwargs)
 
     # Reset back to the original workload args
-    FLAGS['ycsb_timelimit'].parse(ending_length)
-    ending_qps /= len(vms)
-    run_params['target'] = int(ending_qps)
+    FLAGS.ycsb_timelimit = ending_length
+    run_params['target'] = int(ending_qps / client_vms)
     self._SetClientThreadCount(ending_threadcount)
     self._SetRunParameters(run_params)
     return list(self.RunStaircaseLoads(vms, workloads, **run_kwargs))
@@ -19,6 +19,7 @@ from collections.abc import Iterable, Iterator, Mapping
 import copy
 import csv
 import dataclasses
+import heapq
 import io
 import itertools
 import json
@@ -28,6 +29,7 @@ import operator
 import posixpath
 import re
 from absl import flags
+import numpy as np
 from perfkitbenchmarker import background_tasks
 from perfkitbenchmarker import errors
 from perfkitbenchmarker import linux_packages
@@ -49,6 +51,8 @@ HDRHISTOGRAM_TAR_URL = (
     'HdrHistogram-2.1.10.tar.gz'
 )
 HDRHISTOGRAM_GROUPS = ['READ', 'UPDATE']
+# Printed between groups when reading several hdr logs in one command.
+_HDR_LOG_SEPARATOR = '=====HDR_LOG====='
 
 _DEFAULT_PERCENTILES = 50, 75, 90, 95, 99, 99.9
 
@@ -80,6 +84,9 @@ AGGREGATE_OPERATORS = {
     'Max': max,
     'Min': min,
 }
+# Statistics dropped when combining, and the operators for the rest.
+_DROP_KEYS = frozenset(k for k, v in AGGREGATE_OPERATORS.items() if v is None)
+_AGG_OPS = {k: v for k, v in AGGREGATE_OPERATORS.items() if v is not None}
 
 _STATUS_LATENCIES = [
     'Avg',
@@ -88,8 +95,15 @@ _STATUS_LATENCIES = [
 ]
 
 # Status line pattern
-_STATUS_PATTERN = r'(\d+) sec: \d+ operations; (\d+(\.\d+)?) current ops\/sec'
-_STATUS_GROUPS_PATTERN = r'\[(.+?): (.+?)\]'
+_STATUS_RE = re.compile(
+    r'(?P<timestamp>\d+) sec: \d+ operations; '
+    r'(?P<qps>\d+(?:\.\d+)?) current ops/sec'
+)
+# Literal substring of every status line, used to skip the regex cheaply.
+_STATUS_MARKER = ' current ops/sec'
+_STATUS_GROUPS_RE = re.compile(r'\[(.+?): (.+?)\]')
+# Unit suffix of a summary statistic name, e.g. "RunTime(ms)".
+_UNIT_RE = re.compile(r'^(.*) *\((us|ms|ops/sec)\)$')
 # Status interval default is 10 sec, change to 1 sec.
 _STATUS_INTERVAL_SEC = 1
 
@@ -133,8 +147,9 @@ class _OpResult:
       hdrhistogram, or timeseries).
     data: For HISTOGRAM/HDRHISTOGRAM: list of (ms_lower_bound, count) tuples,
       e.g. [(0, 530), (19, 1)] indicates that 530 ops took between 0ms and 1ms,
-      and 1 took between 19ms and 20ms. Empty bins are not reported. For
-      TIMESERIES: list of (time, latency us) tuples.
+      and 1 took between 19ms and 20ms. Empty bins are not reported, and
+      HISTOGRAM bins are sorted. For TIMESERIES: list of (time, latency us)
+      tuples.
   """
 
   group: str = ''
@@ -167,7 +182,10 @@ class _OpResult:
       An _OpResult with the parsed data.
     """
     result = cls(group=operation, data_type=data_type)
-    latency_unit = 'ms'
+    is_timeseries = data_type == TIMESERIES
+    # Timeseries latencies share the unit of the preceding statistics, so they
+    # need converting to ms once a (us) statistic has been seen.
+    scale_data_to_ms = False
     for _, name, val in lines:
       name = name.strip()
       val = val.strip()
@@ -177,27 +195,31 @@ class _OpResult:
       val = float(val) if '.' in val or 'nan' in val.lower() else int(val)
       if name.isdigit():
         if val:
-          if data_type == TIMESERIES and latency_unit == 'us':
+          if scale_data_to_ms:
             val /= 1000.0
           result.data.append((int(name), val))
       else:
         if '(us)' in name:
           name = name.replace('(us)', '(ms)')
           val /= 1000.0
-          latency_unit = 'us'
+          scale_data_to_ms = is_timeseries
         result.statistics[name] = val
+    if data_type == HISTOGRAM:
+      # YCSB reports bins in order, so this is a linear pass which lets
+      # CombineResults merge histograms without re-sorting them.
+      result.data.sort()
     return result
 
   @classmethod
   def FromStatusLine(cls, match: re.Match[str]) -> '_OpResult':
-    """Returns an _OpResult from a _STATUS_GROUPS_PATTERN match.
+    """Returns an _OpResult from a _STATUS_GROUPS_RE match.
 
     Example format:
     [READ: Count=33, Max=11487, Min=2658, Avg=4987.36,
     90=8271, 99=11487, 99.9=11487, 99.99=11487]
 
     Args:
-      match: Match object that matches _STATUS_GROUPS_PATTERN.
+      match: Match object that matches _STATUS_GROUPS_RE.
 
     Returns:
       An _OpResult object with group and statistics.
@@ -274,13 +296,14 @@ class YcsbResult:
 
   def _GetStatsToWrite(self) -> list[str]:
     stats_to_write = set()
-    for _, status_result in sorted(self.status_time_series.items()):
+    # Collecting into a set does not depend on order, so skip sorting.
+    for status_result in self.status_time_series.values():
       for op_result in status_result.op_results:
-        stats_to_write.update([
+        stats_to_write.update(
             stat
             for stat in op_result.statistics.keys()
             if _IsStatusLatencyStatistic(stat) or stat == 'Count'
-        ])
+        )
     return list(stats_to_write)
 
   def WriteStatusTimeSeriesToFile(self) -> None:
@@ -308,7 +331,7 @@ class YcsbResult:
 
 def _ParseStatusLine(line: str) -> Iterator[_OpResult]:
   """Returns a list of _OpResults from granular YCSB status output."""
-  matches = re.finditer(_STATUS_GROUPS_PATTERN, line)
+  matches = _STATUS_GROUPS_RE.finditer(line)
   return (_OpResult.FromStatusLine(match) for match in matches)
 
 
@@ -337,6 +360,9 @@ def _ValidateErrorRate(result: YcsbResult, threshold: float) -> None:
     errors.Benchmarks.RunError: If the computed error rate is higher than the
       threshold.
   """
+  # An error rate can never exceed 1.0, so there is nothing to check.
+  if threshold >= 1.0:
+    return
   for operation in result.groups.values():
     name, stats = operation.group, operation.statistics
     # The operation count can be 0 or keys may be missing from the output
@@ -475,11 +501,15 @@ def ParseResults(
       client_string = result_string
     if result_string.startswith('Command line:'):
       command_line = result_string
-    # Look for status lines which include throughput on a 1-sec basis.
-    match = re.search(_STATUS_PATTERN, result_string)
+    # Look for status lines which include throughput on a 1-sec basis. Most
+    # header lines are not status lines, so rule them out before the regex.
+    match = None
+    if _STATUS_MARKER in result_string:
+      match = _STATUS_RE.search(result_string)
     if match is not None:
-      timestamp, qps = int(match.group(1)), float(match.group(2))
-      timestamp += timestamp_offset_sec
+      timestamp, qps = match.group('timestamp', 'qps')
+      timestamp = int(timestamp) + timestamp_offset_sec
+      qps = float(qps)
       # Repeats in the printed status are erroneous, ignore.
       if timestamp not in status_time_series:
         status_time_series[timestamp] = _StatusResult(
@@ -506,7 +536,9 @@ def ParseResults(
 
   lines = itertools.chain(lines, filter(LineFilter, fp))
 
-  r = csv.reader(lines)
+  # Result lines are always "[OPERATION], name, value" with no quoting, so a
+  # plain split is sufficient and much cheaper than csv.reader.
+  r = (line.split(',', 2) for line in lines)
 
   by_operation = itertools.groupby(r, operator.itemgetter(0))
 
@@ -560,8 +592,11 @@ def ParseHdrLogFile(logfile: str) -> list[_HdrHistogramTuple]:
   last_percent_value = -1
   prev_total_count = 0
   for row in logfile.split('\n'):
-    if re.match(r'( *)(\d|\.)( *)', row):
-      row_vals = row.split()
+    row = row.lstrip()
+    # Only rows starting with a value are data; skip headers and comments.
+    if row and (row[0].isdigit() or row[0] == '.'):
+      # Only the first three columns are used, so stop splitting after them.
+      row_vals = row.split(None, 3)
       # convert percentile to 100 based and round up to 3 decimal places
       percentile = math.floor(float(row_vals[1]) * 100000) / 1000.0
       current_total_count = int(row_vals[2])
@@ -589,11 +624,11 @@ def ParseHdrLogs(
   Returns:
     Dict of group to histogram tuples of reportable percentile values.
   """
-  parsed_hdr_histograms = {}
-  for group, logfile in hdrlogs.items():
-    values = ParseHdrLogFile(logfile)
-    parsed_hdr_histograms[group] = values
-  return parsed_hdr_histograms
+  # Parsing is pure Python and holds the GIL, and there is only one log per
+  # group in HDRHISTOGRAM_GROUPS, so this is intentionally done serially.
+  return {
+      group: ParseHdrLogFile(logfile) for group, logfile in hdrlogs.items()
+  }
 
 
 def _CumulativeSum(xs):
@@ -651,18 +686,24 @@ def _PercentilesFromHistogram(ycsb_histogram, percentiles=_DEFAULT_PERCENTILES):
   Raises:
     ValueError: If one or more percentiles are outside [0, 100].
   """
-  result = collections.OrderedDict()
-  histogram = sorted(ycsb_histogram)
+  labels, quantiles = [], []
   for percentile in percentiles:
     if percentile < 0 or percentile > 100:
       raise ValueError('Invalid percentile: {}'.format(percentile))
     if math.modf(percentile)[0] < 1e-7:
       percentile = int(percentile)
-    label = 'p{}'.format(percentile)
-    latencies, freqs = list(zip(*histogram))
-    time_ms = _WeightedQuantile(latencies, freqs, percentile * 0.01)
-    result[label] = time_ms
-  return result
+    labels.append('p{}'.format(percentile))
+    quantiles.append(percentile * 0.01)
+  histogram = sorted(ycsb_histogram)
+  latencies, freqs = zip(*histogram)
+  latencies = np.array(latencies)
+  # Same semantics as _WeightedQuantile, but the cumulative weights are built
+  # once and all percentiles are located in a single search.
+  cumulative = np.cumsum(freqs)
+  targets = cumulative[-1] * np.array(quantiles)
+  indices = np.searchsorted(cumulative, targets, side='left')
+  indices = np.minimum(indices, len(latencies) - 1)
+  return collections.OrderedDict(zip(labels, latencies[indices].tolist()))
 
 
 def CombineResults(
@@ -689,54 +730,54 @@ def CombineResults(
 
   def DropUnaggregated(result: YcsbResult) -> None:
     """Remove statistics which 'operators' specify should not be combined."""
-    drop_keys = {k for k, v in AGGREGATE_OPERATORS.items() if v is None}
     for group in result.groups.values():
-      for k in drop_keys:
+      for k in _DROP_KEYS:
         group.statistics.pop(k, None)
 
-  def CombineHistograms(hist1, hist2):
-    h1 = dict(hist1)
-    h2 = dict(hist2)
-    keys = sorted(frozenset(h1) | frozenset(h2))
-    result = []
-    for k in keys:
-      result.append((k, h1.get(k, 0) + h2.get(k, 0)))
-    return result
+  def _CopyOpResult(op_result: _OpResult) -> _OpResult:
+    """Returns a copy of op_result which only shares immutable values."""
+    return dataclasses.replace(
+        op_result,
+        data=list(op_result.data),
+        statistics=dict(op_result.statistics),
+    )
 
-  combined_weights = {}
+  def CombineHistograms(
+      histograms: Iterable[list[tuple[int, int]]],
+  ) -> list[tuple[int, int]]:
+    """Sums bin counts across histograms which are each sorted by bin."""
+    merged = heapq.merge(*histograms, key=operator.itemgetter(0))
+    return [
+        (k, sum(count for _, count in bins))
+        for k, bins in itertools.groupby(merged, key=operator.itemgetter(0))
+    ]
 
   def _CombineLatencyTimeSeries(
-      combined_series: list[tuple[int, float]],
-      individual_series: list[tuple[int, float]],
-  ) -> list[tuple[int, float]]:
-    """Combines two timeseries of average latencies.
+      combined_series: dict[int, float],
+      combined_weights: collections.Counter[int],
+      individual_series: Iterable[tuple[int, float]],
+  ) -> None:
+    """Merges a timeseries of average latencies into an accumulator in place.
 
     Args:
-      combined_series: A list representing the timeseries with which the
-        individual series is being merged.
+      combined_series: A dict of timestamp to average latency representing the
+        timeseries with which the individual series is being merged. Updated in
+        place.
+      combined_weights: A counter of timestamp to the number of series merged
+        into combined_series so far. Updated in place.
       individual_series: A list representing the timeseries being merged with
         the combined series.
 
-    Returns:
-      A list representing the new combined series.
-
     Note that this assumes that each individual timeseries spent an equal
     amount of time executing requests for each timeslice. This should hold for
     runs without -target where each client has an equal number of threads, but
     may not hold otherwise.
     """
-    combined_series = dict(combined_series)
-    individual_series = dict(individual_series)
-    timestamps = set(combined_series) | set(individual_series)
-
-    result = []
-    for timestamp in sorted(timestamps):
-      if timestamp not in individual_series:
-        continue
-      if timestamp not in combined_weights:
-        combined_weights[timestamp] = 1.0
-      if timestamp not in combined_series:
-        result.append((timestamp, individual_series[timestamp]))
+    for timestamp, latency in individual_series:
+      combined_weight = combined_weights[timestamp]
+      combined_weights[timestamp] += 1
+      if not combined_weight:
+        combined_series[timestamp] = latency
         continue
 
       # This computes a new combined average latency by dividing the sum of
@@ -747,14 +788,9 @@ def CombineResults(
       # The request count for an individual series is 1 / average latency.
       # This means the request count for the combined series is
       # combined_weight * 1 / average latency.
-      combined_weight = combined_weights[timestamp]
-      average_latency = (combined_weight + 1.0) / (
-          (combined_weight / combined_series[timestamp])
-          + (1.0 / individual_series[timestamp])
+      combined_series[timestamp] = (combined_weight + 1.0) / (
+          (combined_weight / combined_series[timestamp]) + (1.0 / latency)
       )
-      result.append((timestamp, average_latency))
-      combined_weights[timestamp] += 1.0
-    return result
 
   def _CombineStatistics(result1: _OpResult, result2: _OpResult) -> _OpResult:
     """Combines reported statistics.
@@ -771,18 +807,17 @@ def CombineResults(
     Returns:
       A combined _OpResult.
     """
-    combined = copy.deepcopy(result1)
+    combined = _CopyOpResult(result1)
     for k, v in result2.statistics.items():
       # Numeric keys are latencies
-      if k not in AGGREGATE_OPERATORS and not _IsStatusLatencyStatistic(k):
-        continue
-      # Drop if not an aggregated statistic.
-      elif not _IsStatusLatencyStatistic(k) and AGGREGATE_OPERATORS[k] is None:
-        combined.statistics.pop(k, None)
+      if k not in _AGG_OPS and not _IsStatusLatencyStatistic(k):
+        # Drop if not an aggregated statistic.
+        if k in _DROP_KEYS:
+          combined.statistics.pop(k, None)
         continue
       # Copy over if not already in aggregate.
       elif k not in combined.statistics:
-        combined.statistics[k] = copy.deepcopy(v)
+        combined.statistics[k] = v
         continue
 
       # Different cases for average latency and numeric latency when reporting a
@@ -805,7 +840,7 @@ def CombineResults(
         combined.statistics[k] = new_avg
         continue
 
-      op = AGGREGATE_OPERATORS[k]
+      op = _AGG_OPS[k]
       combined.statistics[k] = op(combined.statistics[k], v)
     return combined
 
@@ -815,10 +850,10 @@ def CombineResults(
     """Combines two lists of _OpResult into a single list."""
     list1_by_operation = {result.group: result for result in list1}
     list2_by_operation = {result.group: result for result in list2}
-    result = copy.deepcopy(list1_by_operation)
+    result = dict(list1_by_operation)
     for operation in list2_by_operation:
       if operation not in result:
-        result[operation] = copy.deepcopy(list2_by_operation[operation])
+        result[operation] = _CopyOpResult(list2_by_operation[operation])
       else:
         result[operation] = _CombineStatistics(
             result[operation], list2_by_operation[operation]
@@ -826,40 +861,51 @@ def CombineResults(
     return list(result.values())
 
   def _CombineStatusTimeSeries(
-      series1: Mapping[int, _StatusResult], series2: Mapping[int, _StatusResult]
-  ) -> dict[int, _StatusResult]:
-    """Returns a combined dict of [timestamp, result] from the two series."""
-    timestamps1 = set(series1)
-    timestamps2 = set(series2)
-    all_timestamps = timestamps1 | timestamps2
-    diff_timestamps = timestamps1 ^ timestamps2
-    if diff_timestamps:
-      # This case is rare but does happen occassionally, so log a warning
-      # instead of raising an exception.
-      logging.warning(
-          'Expected combined timestamps to be the same, got different '
-          'timestamps: %s',
-          diff_timestamps,
-      )
-    result = {}
-    for timestamp in all_timestamps:
-      combined_status_result = _StatusResult(timestamp, 0)
-      status1 = series1.get(timestamp, _StatusResult(timestamp, 0))
-      status2 = series2.get(timestamp, _StatusResult(timestamp, 0))
+      combined_series: dict[int, _StatusResult],
+      individual_series: Mapping[int, _StatusResult],
+  ) -> None:
+    """Merges a status time series into an accumulator in place.
+
+    Args:
+      combined_series: A dict of timestamp to _StatusResult owned by the
+        caller. Updated in place.
+      individual_series: A dict of timestamp to _StatusResult to merge in.
+    """
+    for timestamp, status in individual_series.items():
+      combined_status_result = combined_series.get(timestamp)
+      if combined_status_result is None:
+        combined_series[timestamp] = _StatusResult(
+            timestamp, status.overall_throughput, list(status.op_results)
+        )
+        continue
       # Add overall throughputs
-      combined_status_result.overall_throughput = (
-          status1.overall_throughput + status2.overall_throughput
-      )
+      combined_status_result.overall_throughput += status.overall_throughput
       # Combine statistics via operators.
       combined_status_result.op_results = _CombineOpResultLists(
-          status1.op_results, status2.op_results
+          combined_status_result.op_results, status.op_results
       )
-      result[timestamp] = combined_status_result
-    return result
+
+  def _ApplyCombinedHdr(result: YcsbResult) -> None:
+    """Replaces group data with the already aggregated hdr histograms."""
+    if measurement_type == HDRHISTOGRAM:
+      for group_name in combined_hdr:
+        if group_name in result.groups:
+          result.groups[group_name].data = combined_hdr[group_name]
 
   result_list = list(result_list)
-  result = copy.deepcopy(result_list[0])
+  # The accumulator only ever rebinds or mutates its groups' data/statistics
+  # containers, so copying those is enough to leave the inputs untouched.
+  first = result_list[0]
+  result = copy.copy(first)
+  result.groups = {
+      name: _CopyOpResult(group) for name, group in first.groups.items()
+  }
   DropUnaggregated(result)
+  if len(result_list) == 1:
+    # Nothing to merge, so skip rebuilding the data and status time series.
+    result.status_time_series = dict(first.status_time_series)
+    _ApplyCombinedHdr(result)
+    return result
 
   for indiv in result_list[1:]:
     for group_name, group in indiv.groups.items():
@@ -869,7 +915,7 @@ def CombineResults(
             'but not in accumulator.',
             group_name,
         )
-        result.groups[group_name] = copy.deepcopy(group)
+        result.groups[group_name] = _CopyOpResult(group)
         continue
 
       # Combine reported statistics.
@@ -877,47 +923,74 @@ def CombineResults(
       # Otherwise, the aggregated value is either:
       # * The value in 'indiv', if the statistic is not present in 'result' or
       # * AGGREGATE_OPERATORS[statistic](result_value, indiv_value)
+      combined_statistics = result.groups[group_name].statistics
       for k, v in group.statistics.items():
-        if k not in AGGREGATE_OPERATORS:
-          logging.warning('No operator for "%s". Skipping aggregation.', k)
-          continue
-        elif AGGREGATE_OPERATORS[k] is None:  # Drop
-          result.groups[group_name].statistics.pop(k, None)
+        op = _AGG_OPS.get(k)
+        if op is None:
+          if k in _DROP_KEYS:
+            combined_statistics.pop(k, None)
+          else:
+            logging.warning('No operator for "%s". Skipping aggregation.', k)
           continue
-        elif k not in result.groups[group_name].statistics:
+        elif k not in combined_statistics:
           logging.warning(
               'Found statistic "%s.%s" in individual YCSB result, '
               'but not in accumulator.',
               group_name,
               k,
           )
-          result.groups[group_name].statistics[k] = copy.deepcopy(v)
+          combined_statistics[k] = v
           continue
 
-        op = AGGREGATE_OPERATORS[k]
-        result.groups[group_name].statistics[k] = op(
-            result.groups[group_name].statistics[k], v
-        )
+        combined_statistics[k] = op(combined_statistics[k], v)
 
-      if measurement_type == HISTOGRAM:
-        result.groups[group_name].data = CombineHistograms(
-            result.groups[group_name].data, group.data
-        )
-      elif measurement_type == TIMESERIES:
-        result.groups[group_name].data = _CombineLatencyTimeSeries(
-            result.groups[group_name].data, group.data
-        )
-    result.client = ' '.join((result.client, indiv.client))
-    result.command_line = ';'.join((result.command_line, indiv.command_line))
-    result.status_time_series = _CombineStatusTimeSeries(
-        result.status_time_series, indiv.status_time_series
-    )
+  # Join once rather than growing the strings result by result.
+  result.client = ' '.join(r.client for r in result_list)
+  result.command_line = ';'.join(r.command_line for r in result_list)
 
-  if measurement_type == HDRHISTOGRAM:
-    for group_name in combined_hdr:
-      if group_name in result.groups:
-        result.groups[group_name].data = combined_hdr[group_name]
+  # Fold every status time series into one accumulator, then check once that
+  # all clients reported the same timestamps.
+  status_time_series = {}
+  timestamp_counts = collections.Counter()
+  for r in result_list:
+    _CombineStatusTimeSeries(status_time_series, r.status_time_series)
+    timestamp_counts.update(r.status_time_series.keys())
+  diff_timestamps = {
+      t for t, count in timestamp_counts.items() if count != len(result_list)
+  }
+  if diff_timestamps:
+    # This case is rare but does happen occassionally, so log a warning
+    # instead of raising an exception.
+    logging.warning(
+        'Expected combined timestamps to be the same, got different '
+        'timestamps: %s',
+        diff_timestamps,
+    )
+  result.status_time_series = status_time_series
+
+  if measurement_type == HISTOGRAM:
+    # Merge each group's histograms from every result in a single pass rather
+    # than folding them in pairwise.
+    for group_name, group in result.groups.items():
+      group.data = CombineHistograms(
+          r.groups[group_name].data
+          for r in result_list
+          if group_name in r.groups
+      )
+  elif measurement_type == TIMESERIES:
+    # Accumulate each group's series into a single dict and only sort the
+    # combined timestamps once at the end.
+    for group_name, group in result.groups.items():
+      combined_series = {}
+      combined_weights = collections.Counter()
+      for r in result_list:
+        if group_name in r.groups:
+          _CombineLatencyTimeSeries(
+              combined_series, combined_weights, r.groups[group_name].data
+          )
+      group.data = sorted(combined_series.items())
 
+  _ApplyCombinedHdr(result)
   return result
 
 
@@ -950,25 +1023,35 @@ def CombineHdrHistogramLogFiles(
       using HistogramLogProcessor.
   """
   vms = list(vms)
-  hdrhistograms = {}
-  for grouptype in HDRHISTOGRAM_GROUPS:
 
-    def _GetHdrHistogramLog(vm, group=grouptype):
+  def _GetHdrHistogramLogs(vm):
+    # Fetch the last line of every group's log in a single round trip.
+    commands = []
+    for group in HDRHISTOGRAM_GROUPS:
       filename = f'{hdr_files_dir}{group}.hdr'
-      return vm.RemoteCommand(f'touch {filename} && tail -1 {filename}')[0]
+      commands.append(
+          f'touch {filename} && echo {_HDR_LOG_SEPARATOR} && tail -1'
+          f' {filename}'
+      )
+    stdout, _ = vm.RemoteCommand(' && '.join(commands))
+    return stdout.split(_HDR_LOG_SEPARATOR + '\n')[1:]
 
-    results = background_tasks.RunThreaded(_GetHdrHistogramLog, vms)
+  logs_by_vm = background_tasks.RunThreaded(_GetHdrHistogramLogs, vms)
+  worker_vm = vms[0]
+  hdrhistograms = {}
+  for group_index, grouptype in enumerate(HDRHISTOGRAM_GROUPS):
+    results = [logs[group_index] for logs in logs_by_vm]
 
     # It's possible that there is no result for certain group, e.g., read
     # only, update only.
     if not all(results):
       continue
 
-    worker_vm = vms[0]
     hdr_file = f'{hdr_files_dir}{grouptype}.hdr'
-    for hdr in results[1:]:
+    if len(results) > 1:
+      lines = '\n'.join(hdr[:-1] for hdr in results[1:])
       worker_vm.RemoteCommand(
-          f'sudo chmod 755 {hdr_file} && echo "{hdr[:-1]}" >> {hdr_file}'
+          f'sudo chmod 755 {hdr_file} && echo "{lines}" >> {hdr_file}'
       )
     hdrhistogram, stderr, retcode = worker_vm.RemoteCommandWithReturnCode(
         f'cd {hdr_install_dir} && ./HistogramLogProcessor -i'
@@ -1049,7 +1132,7 @@ def CreateSamples(
         continue
 
       unit = ''
-      m = re.match(r'^(.*) *\((us|ms|ops/sec)\)$', statistic)
+      m = _UNIT_RE.match(statistic)
       if m:
         statistic = m.group(1)
         unit = m.group(2)
@@ -1091,14 +1174,15 @@ def CreateSamples(
         )
 
     if group.data and group.data_type == TIMESERIES:
+      metric = ' '.join([group_name, 'AverageLatency (timeseries)'])
       for sample_time, average_latency in group.data:
-        timeseries_meta = meta.copy()
-        timeseries_meta['sample_time'] = sample_time
+        # Each sample needs its own metadata dict since callers annotate it in
+        # place, but build it in one step rather than copying then inserting.
         yield sample.Sample(
-            ' '.join([group_name, 'AverageLatency (timeseries)']),
+            metric,
             average_latency,
             'ms',
-            timeseries_meta,
+            {**meta, 'sample_time': sample_time},
         )
       yield sample.Sample(
           'Average Latency Time Series',
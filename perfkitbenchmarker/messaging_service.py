@@ -115,6 +115,24 @@ class BaseMessagingService(resource.BaseResource):
           os.path.join(prefix, subpath), os.path.join(vm_dest_dir, subpath)
       )
 
+  @staticmethod
+  def _GetRunnerFlags(
+      include_raw_samples: bool,
+      max_in_flight_publishes: int,
+      target_qps: float,
+  ) -> str:
+    """Returns client script flags for runner options not at their defaults."""
+    runner_flags = []
+    if not include_raw_samples:
+      runner_flags.append('--noinclude_raw_samples')
+    if max_in_flight_publishes != 1:
+      runner_flags.append(
+          f'--max_in_flight_publishes={max_in_flight_publishes}'
+      )
+    if target_qps:
+      runner_flags.append(f'--target_qps={target_qps}')
+    return ''.join(' ' + runner_flag for runner_flag in runner_flags)
+
   @abc.abstractmethod
   def _InstallCloudClients(self):
     """Installs software for running benchmarks on the client VM.
@@ -132,6 +150,9 @@ class BaseMessagingService(resource.BaseResource):
       message_size: int,
       warmup_messages: int,
       streaming_pull: bool = False,
+      include_raw_samples: bool = True,
+      max_in_flight_publishes: int = 1,
+      target_qps: float = 0,
   ) -> Dict[str, Any]:
     """Runs remote commands on client VM - benchmark's run phase.
 
@@ -153,6 +174,12 @@ class BaseMessagingService(resource.BaseResource):
         equal to 0 and less than number_of_messages.
       streaming_pull: Set to True if you want to use streaming_pull. False by
         default. Only implemented properly in GCP PubSub.
+      include_raw_samples: Whether to report every latency as metadata of the
+        mean latency metrics.
+      max_in_flight_publishes: Maximum number of concurrent publish requests
+        in the publish latency scenario.
+      target_qps: If non-zero, rate at which the publish latency scenario
+        sends messages open-loop.
 
     Returns:
       Dictionary with metric_name (mean_latency, p50_latency...) as key and the
@@ -108,6 +108,9 @@ class AwsSqs(msgsvc.BaseMessagingService):
       message_size: int,
       warmup_messages: int,
       streaming_pull: bool = False,
+      include_raw_samples: bool = True,
+      max_in_flight_publishes: int = 1,
+      target_qps: float = 0,
   ) -> Dict[str, Any]:
     """Runs remote commands on client VM - benchmark's run phase."""
     if streaming_pull:
@@ -121,6 +124,9 @@ class AwsSqs(msgsvc.BaseMessagingService):
         f'--message_size={message_size} '
         f'--warmup_messages={warmup_messages}'
     )
+    command += self._GetRunnerFlags(
+        include_raw_samples, max_in_flight_publishes, target_qps
+    )
     stdout, _ = self.client_vm.RemoteCommand(command)
     results = json.loads(stdout)
     return results
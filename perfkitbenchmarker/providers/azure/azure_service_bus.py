@@ -83,6 +83,9 @@ class AzureServiceBus(msgsvc.BaseMessagingService):
       message_size: int,
       warmup_messages: int,
       streaming_pull: bool = False,
+      include_raw_samples: bool = True,
+      max_in_flight_publishes: int = 1,
+      target_qps: float = 0,
   ) -> Dict[str, Any]:
     if streaming_pull:
       raise ValueError('Unsupported StreamingPull in AWS SQS.')
@@ -97,6 +100,9 @@ class AzureServiceBus(msgsvc.BaseMessagingService):
         f'--warmup_messages={warmup_messages} '
         f'--connection_str="{connection_str}"'
     )
+    command += self._GetRunnerFlags(
+        include_raw_samples, max_in_flight_publishes, target_qps
+    )
     results = self.client_vm.RemoteCommand(command)
     results = json.loads(results[0])
     return results
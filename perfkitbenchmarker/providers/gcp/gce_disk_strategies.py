@@ -16,6 +16,7 @@
 This module abstract out the disk algorithm for formatting and creating
 scratch disks.
 """
+import re
 import threading
 import time
 from typing import Any
@@ -60,6 +61,7 @@ class CreatePDDiskStrategy(GCPCreateDiskStrategy):
     super().__init__(vm, disk_spec, disk_count)
     self.remote_disk_groups = []
     self.setup_disk_strategy = None
+    interface = gce_disk.NVME if gce_disk.PdDriveIsNvme(vm) else gce_disk.SCSI
     for disk_spec_id, disk_spec in enumerate(self.disk_specs):
       disks = []
       for i in range(disk_spec.num_striped_disks):
@@ -77,10 +79,7 @@ class CreatePDDiskStrategy(GCPCreateDiskStrategy):
             vm.project,
             replica_zones=disk_spec.replica_zones,
         )
-        if gce_disk.PdDriveIsNvme(vm):
-          data_disk.interface = gce_disk.NVME
-        else:
-          data_disk.interface = gce_disk.SCSI
+        data_disk.interface = interface
         vm.remote_disk_counter += 1
         disks.append(data_disk)
       self.remote_disk_groups.append(disks)
@@ -95,6 +94,10 @@ class CreatePDDiskStrategy(GCPCreateDiskStrategy):
   def AddMetadataToDiskResource(self):
     if not self.DiskCreatedOnVMCreation():
       return
+    # add-labels takes a single disk, so share one labels payload across the
+    # per-disk commands instead of batching them.
+    labels = util.MakeFormattedDefaultTags()
+    cmds = []
     for disk_spec_id, disk_spec in enumerate(self.disk_specs):
       for i in range(disk_spec.num_striped_disks):
         name = _GenerateDiskNamePrefix(
@@ -107,8 +110,12 @@ class CreatePDDiskStrategy(GCPCreateDiskStrategy):
         cmd = util.GcloudCommand(
             self.vm, 'compute', 'disks', 'add-labels', name
         )
-        cmd.flags['labels'] = util.MakeFormattedDefaultTags()
-        cmd.Issue()
+        cmd.flags['labels'] = labels
+        cmds.append(cmd)
+    # Each add-labels call is an independent API round trip.
+    background_tasks.RunParallelThreads(
+        [(cmd.Issue, (), {}) for cmd in cmds], max_concurrency=16
+    )
 
   def GetCreationCommand(self) -> dict[str, Any]:
     if not self.DiskCreatedOnVMCreation():
@@ -177,30 +184,69 @@ class GCECreateNonResourceDiskStrategy(disk_strategies.EmptyCreateDiskStrategy):
 class SetUpGCEResourceDiskStrategy(disk_strategies.SetUpDiskStrategy):
   """Base Strategy class to set up local ssd and pd-ssd."""
 
-  def FindRemoteNVMEDevices(self, nvme_devices):
-    """Find the paths for all remote NVME devices inside the VM."""
-    remote_nvme_devices = [
-        device['DevicePath']
-        for device in nvme_devices
-        if device['ModelNumber'] == 'nvme_card-pd'
-    ]
-
-    return sorted(remote_nvme_devices)
+  def FindRemoteNVMEDevices(self, nvme_devices, scratch_disks):
+    """Find the paths of the remote NVME devices backing scratch_disks.
+
+    The disks cannot be told apart inside the VM, so devices are matched by
+    attach order: the boot disk comes first and data disks follow in
+    scratch_disks order, which leaves the data disks on the highest-numbered
+    remote devices, in ascending order.
+
+    Args:
+      nvme_devices: NVMe device info as returned by vm.GetNVMEDeviceInfo().
+      scratch_disks: The disks, possibly striped, in the order they were
+        created and attached.
+
+    Returns:
+      An iterator over the device paths in the order UpdateDevicePath assigns
+      them when called for each of scratch_disks in turn.
+    """
+    remote_nvme_devices = sorted(
+        (
+            device['DevicePath']
+            for device in nvme_devices
+            if device['ModelNumber'] == 'nvme_card-pd'
+        ),
+        key=_DevicePathSortKey,
+    )
+    disk_count = sum(
+        len(self._GetRemoteNvmeDisks(scratch_disk))
+        for scratch_disk in scratch_disks
+    )
+    first_data_device = max(0, len(remote_nvme_devices) - disk_count)
+    return iter(remote_nvme_devices[first_data_device:])
 
-  def UpdateDevicePath(self, scratch_disk, remote_nvme_devices):
-    """Updates the paths for all remote NVME devices inside the VM."""
+  def _GetRemoteNvmeDisks(self, scratch_disk):
+    """Returns the remote NVMe disks making up scratch_disk."""
     if isinstance(scratch_disk, disk.StripedDisk):
       disks = scratch_disk.disks
     else:
       disks = [scratch_disk]
+    return [
+        d
+        for d in disks
+        if d.disk_type in gce_disk.GCE_REMOTE_DISK_TYPES
+        and d.interface == gce_disk.NVME
+    ]
 
-    # round robin assignment since we cannot tell the disks apart.
-    for d in disks:
-      if (
-          d.disk_type in gce_disk.GCE_REMOTE_DISK_TYPES
-          and d.interface == gce_disk.NVME
-      ):
-        d.name = remote_nvme_devices.pop()
+  def UpdateDevicePath(self, scratch_disk, remote_nvme_devices):
+    """Updates the paths for all remote NVME devices inside the VM.
+
+    Args:
+      scratch_disk: The disk, possibly striped, whose device paths to update.
+      remote_nvme_devices: Iterator returned by FindRemoteNVMEDevices. It is
+        shared across calls so every disk receives a distinct device.
+
+    Raises:
+      errors.Error: if there are more remote NVMe disks than devices.
+    """
+    for d in self._GetRemoteNvmeDisks(scratch_disk):
+      device_path = next(remote_nvme_devices, None)
+      if device_path is None:
+        raise errors.Error(
+            f'No remote NVMe device left in the VM for disk {d.name}.'
+        )
+      d.name = device_path
 
   def SetupGCELocalDisks(self):
     """Performs Linux specific setup of local disks."""
@@ -304,7 +350,9 @@ class SetUpMultiWriterPDDiskStrategy(SetUpGCEResourceDiskStrategy):
     # The path is not updated for Windows machines.
     if self.vm.OS_TYPE not in os_types.WINDOWS_OS_TYPES:
       nvme_devices = self.vm.GetNVMEDeviceInfo()
-      remote_nvme_devices = self.FindRemoteNVMEDevices(nvme_devices)
+      remote_nvme_devices = self.FindRemoteNVMEDevices(
+          nvme_devices, [scratch_disk]
+      )
       self.UpdateDevicePath(scratch_disk, remote_nvme_devices)
     if create_and_setup_disk:
       GCEPrepareScratchDiskStrategy().PrepareScratchDisk(
@@ -339,12 +387,17 @@ class SetUpPDDiskStrategy(SetUpGCEResourceDiskStrategy):
     background_tasks.RunParallelThreads(create_tasks, max_concurrency=200)
     self.scratch_disks = [scratch_disk for scratch_disk, _ in scratch_disks]
     self.AttachDisks()
+    # Device path is needed to stripe disks on Linux, but not on Windows.
+    # The path is not updated for Windows machines. All disks are attached by
+    # now, so the devices are listed once and handed out in disk spec order.
+    is_windows = self.vm.OS_TYPE in os_types.WINDOWS_OS_TYPES
+    if not is_windows:
+      nvme_devices = self.vm.GetNVMEDeviceInfo()
+      remote_nvme_devices = self.FindRemoteNVMEDevices(
+          nvme_devices, self.scratch_disks
+      )
     for scratch_disk, disk_spec in scratch_disks:
-      # Device path is needed to stripe disks on Linux, but not on Windows.
-      # The path is not updated for Windows machines.
-      if self.vm.OS_TYPE not in os_types.WINDOWS_OS_TYPES:
-        nvme_devices = self.vm.GetNVMEDeviceInfo()
-        remote_nvme_devices = self.FindRemoteNVMEDevices(nvme_devices)
+      if not is_windows:
         self.UpdateDevicePath(scratch_disk, remote_nvme_devices)
       GCEPrepareScratchDiskStrategy().PrepareScratchDisk(
           self.vm, scratch_disk, disk_spec
@@ -400,6 +453,14 @@ class GCEPrepareScratchDiskStrategy(disk_strategies.PrepareScratchDiskStrategy):
     return ['Google EphemeralDisk', 'nvme_card']
 
 
+def _DevicePathSortKey(device_path: str) -> list[Any]:
+  """Sorts device paths by their numbers, e.g. nvme0n2 before nvme0n10."""
+  return [
+      int(part) if part.isdigit() else part
+      for part in re.split(r'(\d+)', device_path)
+  ]
+
+
 def _GenerateDiskNamePrefix(
     vm: 'virtual_machine. BaseVirtualMachine',
     group_name: str,
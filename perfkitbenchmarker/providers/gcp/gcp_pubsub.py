@@ -86,6 +86,9 @@ class GCPCloudPubSub(msgsvc.BaseMessagingService):
       message_size: int,
       warmup_messages: int,
       streaming_pull: bool = False,
+      include_raw_samples: bool = True,
+      max_in_flight_publishes: int = 1,
+      target_qps: float = 0,
   ) -> Dict[str, Any]:
     """Runs a benchmark on GCP PubSub from the client VM.
 
@@ -105,6 +108,12 @@ class GCPCloudPubSub(msgsvc.BaseMessagingService):
       streaming_pull: Set to True if you want to use streaming_pull. False by
         default. Requires benchmark scenario to be
         GCPCloudPubSub.END_TO_END_LATENCY.
+      include_raw_samples: Whether to report every latency as metadata of the
+        mean latency metrics.
+      max_in_flight_publishes: Maximum number of concurrent publish requests
+        in the publish latency scenario.
+      target_qps: If non-zero, rate at which the publish latency scenario
+        sends messages open-loop.
 
     Returns:
       Dictionary produce by the benchmark with metric_name (mean_latency,
@@ -125,6 +134,9 @@ class GCPCloudPubSub(msgsvc.BaseMessagingService):
         f'--message_size={message_size} '
         f'--warmup_messages={warmup_messages}'
     )
+    command += self._GetRunnerFlags(
+        include_raw_samples, max_in_flight_publishes, target_qps
+    )
     if streaming_pull:
       command += ' --streaming_pull'
     stdout, _ = self.client_vm.RemoteCommand(command)
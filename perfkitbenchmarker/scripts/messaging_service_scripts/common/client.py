@@ -1,6 +1,7 @@
 """This module contains the base cloud client class."""
 
 import abc
+import asyncio
 import base64
 from typing import Any, Callable, Type, TypeVar
 
@@ -85,6 +86,21 @@ class BaseMessagingServiceClient(metaclass=abc.ABCMeta):
       the result from this call.
     """
 
+  async def publish_message_async(self, message_payload: str) -> Any:
+    """Publishes a single message without blocking the event loop.
+
+    Optional override. By default it runs publish_message in a worker thread,
+    so the underlying client must tolerate concurrent publishes when several
+    are in flight.
+
+    Args:
+      message_payload: Message, created by 'generate_message'.
+
+    Returns:
+      The same response as publish_message.
+    """
+    return await asyncio.to_thread(self.publish_message, message_payload)
+
   @abc.abstractmethod
   def pull_message(self, timeout: float = TIMEOUT) -> Any:
     """Pulls a single message from the messaging service.
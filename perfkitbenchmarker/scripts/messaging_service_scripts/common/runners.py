@@ -2,16 +2,19 @@
 
 # pylint: disable=broad-except
 import abc
+import asyncio
+from concurrent import futures
 import json
 import time
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from absl import flags
 import numpy as np
 from perfkitbenchmarker.scripts.messaging_service_scripts.common import client
 
-GET_TIME_IN_MILLISECONDS = lambda: time.time() * 1000
 UNIT_OF_TIME = 'milliseconds'
+NANOSECONDS_PER_MILLISECOND = 1_000_000
+NANOSECONDS_PER_SECOND = 1_000_000_000
 
 _WARMUP_MESSAGES = flags.DEFINE_integer(
     'warmup_messages',
@@ -24,6 +27,37 @@ _WARMUP_MESSAGES = flags.DEFINE_integer(
         'steady_state metrics will be reported (this is the default).'
     ),
 )
+_INCLUDE_RAW_SAMPLES = flags.DEFINE_boolean(
+    'include_raw_samples',
+    True,
+    help=(
+        'Whether to report every individual latency as the "samples" metadata '
+        'of the mean latency metrics. Disable for runs with many messages to '
+        'keep the emitted metrics small.'
+    ),
+)
+_MAX_IN_FLIGHT_PUBLISHES = flags.DEFINE_integer(
+    'max_in_flight_publishes',
+    1,
+    lower_bound=1,
+    help=(
+        'Maximum number of concurrent publish requests in the publish_latency '
+        'scenario. Each message is still timed individually. If set to 1, '
+        'messages are published one at a time (this is the default).'
+    ),
+)
+_TARGET_QPS = flags.DEFINE_float(
+    'target_qps',
+    0,
+    lower_bound=0,
+    help=(
+        'If set, the publish_latency scenario runs open-loop: messages are '
+        'scheduled at this fixed rate and each latency is measured from the '
+        "message's intended send time, so a slow publish also counts against "
+        'the messages queued behind it. If set to 0, each message is sent as '
+        'soon as possible (this is the default).'
+    ),
+)
 
 
 class BaseRunner(metaclass=abc.ABCMeta):
@@ -60,6 +94,20 @@ class BaseRunner(metaclass=abc.ABCMeta):
   def __init__(self, client_: client.BaseMessagingServiceClient):
     self.client = client_
 
+  @staticmethod
+  def _to_milliseconds(
+      start_times: np.ndarray, end_times: np.ndarray, succeeded: np.ndarray
+  ) -> List[float]:
+    """Returns the latencies of succeeded operations in UNIT_OF_TIME.
+
+    Args:
+      start_times: time.perf_counter_ns() readings taken before each operation.
+      end_times: time.perf_counter_ns() readings taken after each operation.
+      succeeded: Mask of the operations that completed successfully.
+    """
+    latencies_ns = end_times[succeeded] - start_times[succeeded]
+    return (latencies_ns / NANOSECONDS_PER_MILLISECOND).tolist()
+
   def _get_summary_statistics(
       self,
       scenario: str,
@@ -71,8 +119,13 @@ class BaseRunner(metaclass=abc.ABCMeta):
     metrics_data = {}
     common_metadata = {}
 
-    latency_mean = np.mean(results)
+    latencies = np.asarray(results, dtype=np.float64)
+    latency_mean = latencies.mean()
     latency_percentage_received = 100 * (len(results) / number_of_messages)
+    # np.percentile selects the ranks it needs with a single np.partition
+    # (introselect) over all requested percentiles rather than a full sort, so
+    # ask for them together.
+    p50, p99, p99_9 = np.percentile(latencies, [50, 99, 99.9])
 
     metrics_data[scenario + '_failure_counter'] = {
         'value': failure_counter,
@@ -82,7 +135,11 @@ class BaseRunner(metaclass=abc.ABCMeta):
     metrics_data[scenario + '_mean'] = {
         'value': latency_mean,
         'unit': UNIT_OF_TIME,
-        'metadata': {'samples': results},
+        'metadata': (
+            {'samples': results}
+            if _INCLUDE_RAW_SAMPLES.value
+            else common_metadata
+        ),
     }
     metrics_data[scenario + '_cold'] = {
         'value': results[0],
@@ -90,33 +147,36 @@ class BaseRunner(metaclass=abc.ABCMeta):
         'metadata': common_metadata,
     }
     metrics_data[scenario + '_p50'] = {
-        'value': np.percentile(results, 50),
+        'value': p50,
         'unit': UNIT_OF_TIME,
         'metadata': common_metadata,
     }
     metrics_data[scenario + '_p99'] = {
-        'value': np.percentile(results, 99),
+        'value': p99,
         'unit': UNIT_OF_TIME,
         'metadata': common_metadata,
     }
     metrics_data[scenario + '_p99_9'] = {
-        'value': np.percentile(results, 99.9),
+        'value': p99_9,
         'unit': UNIT_OF_TIME,
         'metadata': common_metadata,
     }
     if _WARMUP_MESSAGES.value:
+      steady_state_p50, steady_state_p99, steady_state_p99_9 = np.percentile(
+          latencies[_WARMUP_MESSAGES.value :], [50, 99, 99.9]
+      )
       metrics_data[scenario + '_steady_state_p50'] = {
-          'value': np.percentile(results[_WARMUP_MESSAGES.value :], 50),
+          'value': steady_state_p50,
           'unit': UNIT_OF_TIME,
           'metadata': common_metadata,
       }
       metrics_data[scenario + '_steady_state_p99'] = {
-          'value': np.percentile(results[_WARMUP_MESSAGES.value :], 99),
+          'value': steady_state_p99,
           'unit': UNIT_OF_TIME,
           'metadata': common_metadata,
       }
       metrics_data[scenario + '_steady_state_p99_9'] = {
-          'value': np.percentile(results[_WARMUP_MESSAGES.value :], 99.9),
+          'value': steady_state_p99_9,
           'unit': UNIT_OF_TIME,
           'metadata': common_metadata,
       }
@@ -188,32 +248,42 @@ class PullLatencyRunner(BaseRunner):
           ...
         }
     """
-    pull_latencies = []
-    acknowledge_latencies = []
+    start_times = np.empty(number_of_messages, dtype=np.int64)
+    pull_end_times = np.empty_like(start_times)
+    acknowledge_end_times = np.empty_like(start_times)
+    succeeded = np.zeros(number_of_messages, dtype=bool)
     failure_counter = 0
+    # Bound locally so the loop does not repeat attribute lookups per message.
+    perf_counter_ns = time.perf_counter_ns
+    pull_message = self.client.pull_message
+    acknowledge_received_message = self.client.acknowledge_received_message
 
     # attempt to pull 'number_of_messages' messages
-    for _ in range(number_of_messages):
-      start_time = GET_TIME_IN_MILLISECONDS()
+    for i in range(number_of_messages):
+      start_times[i] = perf_counter_ns()
       try:
-        message = self.client.pull_message()
+        message = pull_message()
+        pull_end_times[i] = perf_counter_ns()
+        # An empty pull is an expected failure; count it without raising.
         if message is None:
-          raise Exception('Could not pull the message.')
-        pull_end_time = GET_TIME_IN_MILLISECONDS()
-        self.client.acknowledge_received_message(message)
-        acknowledge_end_time = GET_TIME_IN_MILLISECONDS()
-        pull_latencies.append(pull_end_time - start_time)
-        acknowledge_latencies.append(acknowledge_end_time - start_time)
+          failure_counter += 1
+          continue
+        acknowledge_received_message(message)
+        acknowledge_end_times[i] = perf_counter_ns()
+        succeeded[i] = True
       except Exception:
         failure_counter += 1
 
     # getting summary statistics
     pull_metrics = self._get_summary_statistics(
-        'pull_latency', pull_latencies, number_of_messages, failure_counter
+        'pull_latency',
+        self._to_milliseconds(start_times, pull_end_times, succeeded),
+        number_of_messages,
+        failure_counter,
     )
     acknowledge_metrics = self._get_summary_statistics(
         'pull_and_acknowledge_latency',
-        acknowledge_latencies,
+        self._to_milliseconds(start_times, acknowledge_end_times, succeeded),
         number_of_messages,
         failure_counter,
     )
@@ -244,6 +314,11 @@ class PublishLatencyRunner(BaseRunner):
     rate is one of the statistics generated by '_get_summary_statistics').
     Publish failure should be very rare in normal conditions.
 
+    With --target_qps, messages are instead sent on a fixed schedule and each
+    latency runs from the message's scheduled send time, which avoids the
+    coordinated omission of a closed-loop client that backs off whenever the
+    service is slow.
+
     Args:
       number_of_messages: Number of messages to publish.
       message_size: Size of the messages that are being published. It specifies
@@ -258,27 +333,114 @@ class PublishLatencyRunner(BaseRunner):
           ...
         }
     """
-    publish_latencies = []
+    start_times = np.empty(number_of_messages, dtype=np.int64)
+    end_times = np.empty_like(start_times)
+    succeeded = np.zeros(number_of_messages, dtype=bool)
     failure_counter = 0
-
-    # publishing 'number_of_messages' messages
-    for i in range(number_of_messages):
-      message_payload = self.client.generate_message(i, message_size)
-      start_time = GET_TIME_IN_MILLISECONDS()
-      # Publishing a message and waiting for completion
-      try:
-        self.client.publish_message(message_payload)
-        end_time = GET_TIME_IN_MILLISECONDS()
-        publish_latencies.append(end_time - start_time)
-      except Exception:
-        failure_counter += 1
+    send_times = self._get_send_schedule(number_of_messages)
+
+    if _MAX_IN_FLIGHT_PUBLISHES.value > 1:
+      asyncio.run(
+          self._publish_pipelined(
+              message_size, start_times, end_times, succeeded, send_times
+          )
+      )
+      failure_counter = number_of_messages - int(np.count_nonzero(succeeded))
+    else:
+      # Bound locally so the loop does not repeat attribute lookups per message.
+      perf_counter_ns = time.perf_counter_ns
+      generate_message = self.client.generate_message
+      publish_message = self.client.publish_message
+
+      # publishing 'number_of_messages' messages
+      for i in range(number_of_messages):
+        message_payload = generate_message(i, message_size)
+        if send_times is not None:
+          delay_ns = send_times[i] - perf_counter_ns()
+          if delay_ns > 0:
+            time.sleep(delay_ns / NANOSECONDS_PER_SECOND)
+        # Publishing a message and waiting for completion
+        try:
+          start = perf_counter_ns()
+          publish_message(message_payload)
+          end = perf_counter_ns()
+        except Exception:
+          failure_counter += 1
+        else:
+          start_times[i] = start
+          end_times[i] = end
+          succeeded[i] = True
+
+    if send_times is not None:
+      # Open-loop latency runs from when each message should have been sent.
+      start_times = send_times
 
     # getting metrics for publish, pull, and acknowledge latencies
     publish_metrics = self._get_summary_statistics(
         'publish_latency',
-        publish_latencies,
+        self._to_milliseconds(start_times, end_times, succeeded),
         number_of_messages,
         failure_counter,
     )
     print(json.dumps(publish_metrics))
     return publish_metrics
+
+  @staticmethod
+  def _get_send_schedule(number_of_messages: int) -> Optional[np.ndarray]:
+    """Returns each message's intended send time, or None if not paced."""
+    if not _TARGET_QPS.value:
+      return None
+    interval_ns = NANOSECONDS_PER_SECOND / _TARGET_QPS.value
+    offsets_ns = np.arange(number_of_messages) * interval_ns
+    return time.perf_counter_ns() + offsets_ns.astype(np.int64)
+
+  async def _publish_pipelined(
+      self,
+      message_size: int,
+      start_times: np.ndarray,
+      end_times: np.ndarray,
+      succeeded: np.ndarray,
+      send_times: Optional[np.ndarray],
+  ) -> None:
+    """Publishes messages keeping up to --max_in_flight_publishes in flight.
+
+    A fixed pool of workers shares one sequence of message indices, so memory
+    stays bounded regardless of number_of_messages. Each publish is timed on
+    its own and recorded in its slot of the preallocated arrays. The default
+    executor is sized to --max_in_flight_publishes so that publishes run by
+    thread-backed clients never queue for a thread while being timed.
+
+    Args:
+      message_size: Size of the messages that are being published.
+      start_times: Array receiving each publish's start timestamp.
+      end_times: Array receiving each publish's end timestamp.
+      succeeded: Mask set for each message that was successfully published.
+      send_times: Intended send time of each message, or None to send as soon
+        as a worker is free.
+    """
+    indices = iter(range(len(start_times)))
+
+    async def worker():
+      for i in indices:
+        message_payload = self.client.generate_message(i, message_size)
+        if send_times is not None:
+          delay_ns = send_times[i] - time.perf_counter_ns()
+          if delay_ns > 0:
+            await asyncio.sleep(delay_ns / NANOSECONDS_PER_SECOND)
+        try:
+          start = time.perf_counter_ns()
+          await self.client.publish_message_async(message_payload)
+          end = time.perf_counter_ns()
+        except Exception:
+          continue
+        start_times[i] = start
+        end_times[i] = end
+        succeeded[i] = True
+
+    with futures.ThreadPoolExecutor(
+        max_workers=_MAX_IN_FLIGHT_PUBLISHES.value
+    ) as executor:
+      asyncio.get_running_loop().set_default_executor(executor)
+      await asyncio.gather(
+          *(worker() for _ in range(_MAX_IN_FLIGHT_PUBLISHES.value))
+      )
@@ -5,8 +5,10 @@ import json
 import os
 import unittest
 
+from absl.testing import flagsaver
 from absl.testing import parameterized
 import freezegun
+import mock
 from perfkitbenchmarker import sample
 from perfkitbenchmarker.linux_benchmarks import messaging_service_benchmark
 
@@ -39,6 +41,9 @@ _AGGREGATE_SAMPLES = [
             'message_size': MESSAGE_SIZE,
             'cloud': CLOUD,
             'streaming_pull': False,
+            'include_raw_samples': True,
+            'max_in_flight_publishes': 1,
+            'target_qps': 0,
         },
     ),
     sample.Sample(
@@ -51,6 +56,9 @@ _AGGREGATE_SAMPLES = [
             'message_size': MESSAGE_SIZE,
             'cloud': CLOUD,
             'streaming_pull': False,
+            'include_raw_samples': True,
+            'max_in_flight_publishes': 1,
+            'target_qps': 0,
         },
     ),
     sample.Sample(
@@ -63,6 +71,9 @@ _AGGREGATE_SAMPLES = [
             'message_size': MESSAGE_SIZE,
             'cloud': CLOUD,
             'streaming_pull': False,
+            'include_raw_samples': True,
+            'max_in_flight_publishes': 1,
+            'target_qps': 0,
         },
     ),
     sample.Sample(
@@ -75,6 +86,9 @@ _AGGREGATE_SAMPLES = [
             'message_size': MESSAGE_SIZE,
             'cloud': CLOUD,
             'streaming_pull': False,
+            'include_raw_samples': True,
+            'max_in_flight_publishes': 1,
+            'target_qps': 0,
         },
     ),
     sample.Sample(
@@ -87,6 +101,9 @@ _AGGREGATE_SAMPLES = [
             'message_size': MESSAGE_SIZE,
             'cloud': CLOUD,
             'streaming_pull': False,
+            'include_raw_samples': True,
+            'max_in_flight_publishes': 1,
+            'target_qps': 0,
         },
     ),
     sample.Sample(
@@ -99,6 +116,9 @@ _AGGREGATE_SAMPLES = [
             'message_size': MESSAGE_SIZE,
             'cloud': CLOUD,
             'streaming_pull': False,
+            'include_raw_samples': True,
+            'max_in_flight_publishes': 1,
+            'target_qps': 0,
         },
     ),
     sample.Sample(
@@ -123,6 +143,9 @@ _AGGREGATE_SAMPLES = [
             'message_size': MESSAGE_SIZE,
             'cloud': CLOUD,
             'streaming_pull': False,
+            'include_raw_samples': True,
+            'max_in_flight_publishes': 1,
+            'target_qps': 0,
         },
     ),
     sample.Sample(
@@ -135,6 +158,9 @@ _AGGREGATE_SAMPLES = [
             'message_size': MESSAGE_SIZE,
             'cloud': CLOUD,
             'streaming_pull': False,
+            'include_raw_samples': True,
+            'max_in_flight_publishes': 1,
+            'target_qps': 0,
         },
     ),
     sample.Sample(
@@ -147,6 +173,9 @@ _AGGREGATE_SAMPLES = [
             'message_size': MESSAGE_SIZE,
             'cloud': CLOUD,
             'streaming_pull': False,
+            'include_raw_samples': True,
+            'max_in_flight_publishes': 1,
+            'target_qps': 0,
         },
     ),
     sample.Sample(
@@ -159,6 +188,9 @@ _AGGREGATE_SAMPLES = [
             'message_size': MESSAGE_SIZE,
             'cloud': CLOUD,
             'streaming_pull': False,
+            'include_raw_samples': True,
+            'max_in_flight_publishes': 1,
+            'target_qps': 0,
         },
     ),
     sample.Sample(
@@ -171,6 +203,9 @@ _AGGREGATE_SAMPLES = [
             'message_size': MESSAGE_SIZE,
             'cloud': CLOUD,
             'streaming_pull': False,
+            'include_raw_samples': True,
+            'max_in_flight_publishes': 1,
+            'target_qps': 0,
         },
     ),
     sample.Sample(
@@ -183,6 +218,9 @@ _AGGREGATE_SAMPLES = [
             'message_size': MESSAGE_SIZE,
             'cloud': CLOUD,
             'streaming_pull': False,
+            'include_raw_samples': True,
+            'max_in_flight_publishes': 1,
+            'target_qps': 0,
         },
     ),
 ]
@@ -202,7 +240,14 @@ class MessagingServiceBenchmarkTest(parameterized.TestCase):
   @parameterized.named_parameters(('aggregate_samples', _AGGREGATE_SAMPLES))
   def testCreateSamples(self, expected_samples):
     actual_samples = messaging_service_benchmark._CreateSamples(
-        self.contents, NUMBER_OF_MESSAGES, MESSAGE_SIZE, CLOUD, False
+        self.contents,
+        NUMBER_OF_MESSAGES,
+        MESSAGE_SIZE,
+        CLOUD,
+        False,
+        True,
+        1,
+        0,
     )
 
     for expected_sample in expected_samples:
@@ -214,5 +259,39 @@ class MessagingServiceBenchmarkTest(parameterized.TestCase):
         raise Exception(sample_not_found_message)
 
 
+  @flagsaver.flagsaver(
+      cloud=CLOUD,
+      messaging_service_measurement=messaging_service_benchmark.SINGLE_OP,
+      messaging_service_number_of_messages=NUMBER_OF_MESSAGES,
+      messaging_service_message_size=MESSAGE_SIZE,
+      messaging_service_include_raw_samples=False,
+      messaging_service_max_in_flight_publishes=8,
+      messaging_service_target_qps=500,
+  )
+  def testRunForwardsRunnerOptions(self):
+    benchmark_spec = mock.Mock()
+    service = benchmark_spec.messaging_service
+    service.Run.side_effect = [
+        {'publish_latency_p99': {'value': 1.0, 'unit': 'ms', 'metadata': {}}},
+        {'pull_latency_p99': {'value': 2.0, 'unit': 'ms', 'metadata': {}}},
+    ]
+
+    samples = messaging_service_benchmark.Run(benchmark_spec)
+
+    runner_options = {
+        'include_raw_samples': False,
+        'max_in_flight_publishes': 8,
+        'target_qps': 500,
+    }
+    for call in service.Run.call_args_list:
+      self.assertEqual(call.kwargs, runner_options)
+    self.assertLen(samples, 2)
+    for actual_sample in samples:
+      self.assertEqual(
+          {key: actual_sample.metadata[key] for key in runner_options},
+          runner_options,
+      )
+
+
 if __name__ == '__main__':
   unittest.main()
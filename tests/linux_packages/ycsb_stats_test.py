@@ -262,6 +262,17 @@ class ParseWorkloadTestCase(unittest.TestCase):
         ycsb.ParseWorkload('#Sample!\nrecordcount = 10'),
     )
 
+  def testParsesSeparatorForms(self):
+    contents = 'a=1\nb = 2\nc : 3\nd:4\ne = f:5\ng: h=6\n'
+    self.assertDictEqual(
+        {'a': '1', 'b': '2', 'c': '3', 'd': '4', 'e': 'f:5', 'g': 'h=6'},
+        ycsb.ParseWorkload(contents),
+    )
+
+  def testRaisesOnLineWithoutSeparator(self):
+    with self.assertRaises(ValueError):
+      ycsb.ParseWorkload('a=1\nmalformed\n')
+
   def testParsesSampleWorkload(self):
     contents = open_data_file('ycsb_workloada')
     actual = ycsb.ParseWorkload(contents)
@@ -318,6 +329,40 @@ class CombineResultsTestCase(unittest.TestCase):
         {'Operations': 196, 'Return=0': 194, 'Return=-1': 2}, read_stats
     )
 
+  def testCombineHistograms(self):
+    results = [
+        ycsb_stats.YcsbResult(
+            groups={
+                'read': ycsb_stats._OpResult(
+                    group='read', data_type=ycsb_stats.HISTOGRAM, data=data
+                )
+            }
+        )
+        for data in ([(0, 5), (2, 1)], [(1, 3), (2, 2)], [(0, 1)])
+    ]
+    combined = ycsb_stats.CombineResults(results, ycsb_stats.HISTOGRAM, {})
+    self.assertEqual([(0, 6), (1, 3), (2, 3)], combined.groups['read'].data)
+
+  def testCombineLatencyTimeSeries(self):
+    results = [
+        ycsb_stats.YcsbResult(
+            groups={
+                group: ycsb_stats._OpResult(
+                    group=group, data_type=ycsb_stats.TIMESERIES, data=data
+                )
+                for group in ('read', 'update')
+            }
+        )
+        for data in ([(0, 1.0), (500, 2.0)], [(0, 3.0)], [(0, 3.0)])
+    ]
+    combined = ycsb_stats.CombineResults(results, ycsb_stats.TIMESERIES, {})
+    for group in ('read', 'update'):
+      with self.subTest(group):
+        timestamps, latencies = zip(*combined.groups[group].data)
+        self.assertEqual((0, 500), timestamps)
+        self.assertAlmostEqual(1.8, latencies[0])
+        self.assertAlmostEqual(2.0, latencies[1])
+
   def testDropUnaggregatedFromSingleResult(self):
     r = ycsb_stats.YcsbResult(
         client='',
@@ -364,6 +409,30 @@ class HdrLogsParserTestCase(unittest.TestCase):
     ]
     self.assertEqual(actual, expected)
 
+  def testCombineHdrHistogramLogFiles(self):
+    separator = ycsb_stats._HDR_LOG_SEPARATOR
+    vms = [mock.Mock() for _ in range(3)]
+    for i, vm in enumerate(vms):
+      # Only READ has a result; UPDATE is empty.
+      vm.RemoteCommand.return_value = (
+          f'{separator}\nread{i}\n{separator}\n',
+          '',
+      )
+    vms[0].RemoteCommandWithReturnCode.return_value = ('combined', '', 0)
+
+    actual = ycsb_stats.CombineHdrHistogramLogFiles('/hdr', '/logs/', vms)
+
+    self.assertEqual(actual, {'read': 'combined'})
+    for vm in vms:
+      tail_command = vm.RemoteCommand.call_args_list[0][0][0]
+      self.assertIn('tail -1 /logs/READ.hdr', tail_command)
+      self.assertIn('tail -1 /logs/UPDATE.hdr', tail_command)
+    vms[0].RemoteCommand.assert_called_with(
+        'sudo chmod 755 /logs/READ.hdr && '
+        'echo "read1\nread2" >> /logs/READ.hdr'
+    )
+    self.assertEqual(vms[0].RemoteCommand.call_count, 2)
+
 
 class YcsbResultTestCase(pkb_common_test_case.PkbCommonTestCase):
 
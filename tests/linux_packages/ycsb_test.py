@@ -62,6 +62,15 @@ class PrerequisitesTestCase(pkb_common_test_case.PkbCommonTestCase):
     with self.assertRaises(errors.Config.InvalidValue):
       ycsb.CheckPrerequisites()
 
+  @flagsaver.flagsaver
+  def testMissingWorkloadFileRaises(self):
+    # Arrange
+    FLAGS.ycsb_workload_files = ['not_a_workload']
+
+    # Act & Assert
+    with self.assertRaises(OSError):
+      ycsb.CheckPrerequisites()
+
 
 class RunTestCase(pkb_common_test_case.PkbCommonTestCase):
 
@@ -116,6 +125,11 @@ class RunTestCase(pkb_common_test_case.PkbCommonTestCase):
     self.assertIn('-target 500', self.test_cmd.call_args[0][0])
     self.assertIn('-target 500', self.test_cmd_2.call_args[0][0])
 
+  @flagsaver.flagsaver(ycsb_run_parameters=['target'])
+  def testRunRejectsParameterWithoutValue(self):
+    with self.assertRaises(ValueError):
+      ycsb._GetRunParameters()
+
   @flagsaver.flagsaver(ycsb_run_parameters=['target=100'])
   def testRunCalledWithCorrectTargetMultiVmRunParameters(self):
     self.enter_context(
@@ -172,6 +172,18 @@ class MessagingServiceTest(pkb_common_test_case.PkbCommonTestCase):
         ),
     ])
 
+  def testGetRunnerFlagsOmitsDefaults(self):
+    self.assertEqual(
+        messaging_service.BaseMessagingService._GetRunnerFlags(True, 1, 0), ''
+    )
+
+  def testGetRunnerFlags(self):
+    self.assertEqual(
+        messaging_service.BaseMessagingService._GetRunnerFlags(False, 4, 250.5),
+        ' --noinclude_raw_samples --max_in_flight_publishes=4'
+        ' --target_qps=250.5',
+    )
+
 
 if __name__ == '__main__':
   unittest.main()
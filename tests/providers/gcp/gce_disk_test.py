@@ -24,10 +24,12 @@ import mock
 from perfkitbenchmarker import context
 from perfkitbenchmarker import custom_virtual_machine_spec
 from perfkitbenchmarker import disk
+from perfkitbenchmarker import errors
 from perfkitbenchmarker import os_types
 from perfkitbenchmarker import virtual_machine
 from perfkitbenchmarker import vm_util
 from perfkitbenchmarker.providers.gcp import gce_disk
+from perfkitbenchmarker.providers.gcp import gce_disk_strategies
 from perfkitbenchmarker.providers.gcp import gce_nfs_service
 from perfkitbenchmarker.providers.gcp import gce_virtual_machine
 from perfkitbenchmarker.providers.gcp import gce_windows_virtual_machine
@@ -490,6 +492,94 @@ class GCENFSDiskTest(GCEDiskTest):
       )
 
 
+class RemoteNvmeDevicePathTest(pkb_common_test_case.PkbCommonTestCase):
+
+  def _RemoteNvmeDisk(self, name):
+    return mock.Mock(
+        disk_type=gce_disk.PD_SSD,
+        interface=gce_disk.NVME,
+        name=name,
+        metadata={},
+        zone='us-central1-a',
+    )
+
+  def _PdDevice(self, device_path):
+    return {'DevicePath': device_path, 'ModelNumber': 'nvme_card-pd'}
+
+  def testSetUpDiskAssignsDevicesInDiskSpecOrder(self):
+    disk_specs = [
+        gce_disk.GceDiskSpec(
+            _COMPONENT, disk_type=gce_disk.PD_SSD, mount_point='/scratch0'
+        ),
+        gce_disk.GceDiskSpec(
+            _COMPONENT,
+            disk_type=gce_disk.PD_BALANCED,
+            mount_point='/scratch1',
+            num_striped_disks=2,
+        ),
+    ]
+    spec_0_disk = self._RemoteNvmeDisk('disk-0')
+    spec_1_disks = [
+        self._RemoteNvmeDisk('disk-1-0'),
+        self._RemoteNvmeDisk('disk-1-1'),
+    ]
+    vm = mock.Mock(OS_TYPE=os_types.DEFAULT)
+    vm.create_disk_strategy.remote_disk_groups = [[spec_0_disk], spec_1_disks]
+    vm.create_disk_strategy.DiskCreatedOnVMCreation.return_value = True
+    # The boot disk is attached first; the local SSD is not a remote device.
+    vm.GetNVMEDeviceInfo.return_value = [
+        self._PdDevice('/dev/nvme0n4'),
+        {'DevicePath': '/dev/nvme1n1', 'ModelNumber': 'nvme_card'},
+        self._PdDevice('/dev/nvme0n1'),
+        self._PdDevice('/dev/nvme0n3'),
+        self._PdDevice('/dev/nvme0n2'),
+    ]
+    prepare_mock = self.enter_context(
+        mock.patch.object(
+            gce_disk_strategies.GCEPrepareScratchDiskStrategy,
+            'PrepareScratchDisk',
+        )
+    )
+
+    gce_disk_strategies.SetUpPDDiskStrategy(vm, disk_specs).SetUpDisk()
+
+    vm.GetNVMEDeviceInfo.assert_called_once_with()
+    self.assertEqual(prepare_mock.call_count, 2)
+    self.assertEqual(spec_0_disk.name, '/dev/nvme0n2')
+    self.assertEqual(
+        [d.name for d in spec_1_disks], ['/dev/nvme0n3', '/dev/nvme0n4']
+    )
+
+  def testOrdersDevicesNumerically(self):
+    strategy = gce_disk_strategies.SetUpGCEResourceDiskStrategy(
+        mock.Mock(), mock.Mock()
+    )
+    nvme_devices = [
+        self._PdDevice(f'/dev/nvme0n{i}') for i in (10, 1, 9, 2, 11)
+    ]
+    scratch_disk = self._RemoteNvmeDisk('disk-0')
+    remote_nvme_devices = strategy.FindRemoteNVMEDevices(
+        nvme_devices, [scratch_disk]
+    )
+    strategy.UpdateDevicePath(scratch_disk, remote_nvme_devices)
+    self.assertEqual(scratch_disk.name, '/dev/nvme0n11')
+
+  def testRaisesWhenDevicesRunOut(self):
+    strategy = gce_disk_strategies.SetUpGCEResourceDiskStrategy(
+        mock.Mock(), mock.Mock()
+    )
+    scratch_disks = [
+        self._RemoteNvmeDisk('disk-1'),
+        self._RemoteNvmeDisk('disk-2'),
+    ]
+    remote_nvme_devices = strategy.FindRemoteNVMEDevices(
+        [self._PdDevice('/dev/nvme0n2')], scratch_disks
+    )
+    strategy.UpdateDevicePath(scratch_disks[0], remote_nvme_devices)
+    with self.assertRaisesRegex(errors.Error, 'disk-2'):
+      strategy.UpdateDevicePath(scratch_disks[1], remote_nvme_devices)
+
+
 class DiskUtilTest(pkb_common_test_case.PkbCommonTestCase):
 
   @parameterized.named_parameters(
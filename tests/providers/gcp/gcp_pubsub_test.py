@@ -199,6 +199,24 @@ class GcpPubsubTest(pkb_common_test_case.PkbCommonTestCase):
     )
     self.client.RemoteCommand.assert_called_with(remote_run_cmd)
 
+  def testRunWithRunnerOptions(self):
+    self.client.RemoteCommand.return_value = ['{"mock1": 1}', None]
+
+    self.pubsub.Run(
+        BENCHMARK_SCENARIO,
+        NUMBER_OF_MESSAGES,
+        MESSAGE_SIZE,
+        WARMUP_MESSAGES,
+        include_raw_samples=False,
+        max_in_flight_publishes=8,
+        target_qps=500,
+    )
+    self.assertEndsWith(
+        self.client.RemoteCommand.call_args[0][0],
+        f'--warmup_messages={WARMUP_MESSAGES} --noinclude_raw_samples '
+        '--max_in_flight_publishes=8 --target_qps=500',
+    )
+
   @mock.patch.object(pubsub.GCPCloudPubSub, '_DeleteSubscription')
   @mock.patch.object(pubsub.GCPCloudPubSub, '_DeleteTopic')
   def testDelete(self, delete_topic_mock, delete_subscription_mock):
@@ -1,12 +1,16 @@
 """Tests for scripts/messaging_service_scripts/common/runners.py."""
 
 import datetime
+import os
+import threading
 import typing
 import unittest
 
+from absl.testing import flagsaver
 from absl.testing import parameterized
 import freezegun
 import mock
+from perfkitbenchmarker.scripts.messaging_service_scripts.common import client
 from perfkitbenchmarker.scripts.messaging_service_scripts.common import runners
 
 FAKE_DATETIME = datetime.datetime(2021, 6, 14)
@@ -91,6 +95,33 @@ AGGREGATE_PULL_METRICS = {
 }
 
 
+class BarrierPublishClient(client.BaseMessagingServiceClient):
+  """Client whose blocking publishes only return once enough run at once."""
+
+  def __init__(self, concurrent_publishes):
+    # The timeout only bounds a failing test; passing runs never wait on it.
+    self.barrier = threading.Barrier(concurrent_publishes, timeout=10)
+
+  @classmethod
+  def from_flags(cls):
+    raise NotImplementedError
+
+  def _get_first_six_bytes_from_payload(self, message):
+    return message[:6].encode()
+
+  def publish_message(self, message_payload):
+    self.barrier.wait()
+
+  def pull_message(self, timeout=client.TIMEOUT):
+    return None
+
+  def acknowledge_received_message(self, response):
+    pass
+
+  def purge_messages(self):
+    pass
+
+
 @freezegun.freeze_time(FAKE_DATETIME)
 class MessagingServiceScriptsRunnersTest(parameterized.TestCase):
 
@@ -126,6 +157,14 @@ class MessagingServiceScriptsRunnersTest(parameterized.TestCase):
         )
         raise Exception(sample_doesnt_match_message)
 
+  @flagsaver.flagsaver(include_raw_samples=False)
+  def testGetSummaryStatisticsWithoutRawSamples(self):
+    runner = runners.PublishLatencyRunner(mock.Mock())
+    actual_samples = runner._get_summary_statistics(
+        'publish_latency', METRICS, NUMBER_OF_MESSAGES, FAILURE_COUNTER
+    )
+    self.assertEqual(actual_samples['publish_latency_mean']['metadata'], {})
+
   @mock.patch.object(
       runners.PublishLatencyRunner,
       '_get_summary_statistics',
@@ -163,6 +202,62 @@ class MessagingServiceScriptsRunnersTest(parameterized.TestCase):
         'publish_latency', [], NUMBER_OF_MESSAGES, FAILURE_COUNTER
     )
 
+  @flagsaver.flagsaver(max_in_flight_publishes=4)
+  @mock.patch.object(
+      runners.PublishLatencyRunner,
+      '_get_summary_statistics',
+      return_value={'mocked_dict': 'mocked_value'},
+  )
+  def testPublishMessagesPipelined(self, summary_statistics_mock):
+    client_mock = mock.Mock()
+    client_mock.publish_message_async = mock.AsyncMock(
+        side_effect=[Exception('MockedException')]
+        + [None] * (NUMBER_OF_MESSAGES - 1)
+    )
+    runner = runners.PublishLatencyRunner(client_mock)
+    results = runner.run_phase(NUMBER_OF_MESSAGES, MESSAGE_SIZE)
+    self.assertEqual(results, {'mocked_dict': 'mocked_value'})
+
+    self.assertEqual(
+        client_mock.publish_message_async.await_count, NUMBER_OF_MESSAGES
+    )
+    client_mock.publish_message.assert_not_called()
+    _, latencies, _, failure_counter = summary_statistics_mock.call_args[0]
+    self.assertLen(latencies, NUMBER_OF_MESSAGES - 1)
+    self.assertEqual(failure_counter, 1)
+
+  @flagsaver.flagsaver(target_qps=1000)
+  @mock.patch.object(
+      runners.PublishLatencyRunner,
+      '_get_summary_statistics',
+      return_value={'mocked_dict': 'mocked_value'},
+  )
+  def testPublishMessagesOpenLoop(self, summary_statistics_mock):
+    clock_ns = [0]
+
+    def AdvanceClock(seconds):
+      clock_ns[0] += round(seconds * 1_000_000_000)
+
+    publish_durations = iter([0.0035] + [0.0005] * (NUMBER_OF_MESSAGES - 1))
+    client_mock = mock.Mock()
+    # The first publish stalls for 3.5 ms, the rest take 0.5 ms.
+    client_mock.publish_message.side_effect = lambda _: AdvanceClock(
+        next(publish_durations)
+    )
+    runner = runners.PublishLatencyRunner(client_mock)
+    with mock.patch.object(
+        runners.time, 'perf_counter_ns', side_effect=lambda: clock_ns[0]
+    ), mock.patch.object(runners.time, 'sleep', side_effect=AdvanceClock):
+      runner.run_phase(NUMBER_OF_MESSAGES, MESSAGE_SIZE)
+
+    _, latencies, _, failure_counter = summary_statistics_mock.call_args[0]
+    # Messages queued behind the stalled publish are charged from their
+    # scheduled send time (one every 1 ms).
+    self.assertSequenceAlmostEqual(
+        latencies, [3.5, 3.0, 2.5, 2.0, 1.5, 1.0, 0.5, 0.5, 0.5, 0.5]
+    )
+    self.assertEqual(failure_counter, 0)
+
   @mock.patch.object(
       runners.PullLatencyRunner,
       '_get_summary_statistics',
@@ -210,5 +305,28 @@ class MessagingServiceScriptsRunnersTest(parameterized.TestCase):
     )
 
 
+class PipelinedPublishConcurrencyTest(parameterized.TestCase):
+  """Kept out of the frozen-time tests since barrier timeouts need a clock."""
+
+  @flagsaver.flagsaver(max_in_flight_publishes=16)
+  @mock.patch.object(
+      runners.PublishLatencyRunner,
+      '_get_summary_statistics',
+      return_value={'mocked_dict': 'mocked_value'},
+  )
+  def testAllInFlightPublishesRunConcurrently(self, summary_statistics_mock):
+    # With one CPU asyncio's stock default executor would have only 5 threads,
+    # so the 16 publishes could never all reach the barrier and would fail.
+    publish_client = BarrierPublishClient(concurrent_publishes=16)
+    with mock.patch.object(os, 'cpu_count', return_value=1):
+      runner = runners.PublishLatencyRunner(publish_client)
+      runner.run_phase(32, MESSAGE_SIZE)
+
+    _, latencies, _, failure_counter = summary_statistics_mock.call_args[0]
+    self.assertEqual(failure_counter, 0)
+    self.assertLen(latencies, 32)
+    self.assertFalse(publish_client.barrier.broken)
+
+
 if __name__ == '__main__':
   unittest.main()